@@ -24,6 +24,8 @@ class DistributionRegistry(Protocol):
 
     async def initialize(self) -> None: ...
 
+    async def shutdown(self) -> None: ...
+
     async def get(self, identifier: str) -> Optional[RoutableObjectWithProvider]: ...
 
     def get_cached(self, identifier: str) -> Optional[RoutableObjectWithProvider]: ...
@@ -67,6 +69,9 @@ class DiskDistributionRegistry(DistributionRegistry):
     async def initialize(self) -> None:
         pass
 
+    async def shutdown(self) -> None:
+        await self.kvstore.shutdown()
+
     def get_cached(self, type: str, identifier: str) -> Optional[RoutableObjectWithProvider]:
         # Disk registry does not have a cache
         raise NotImplementedError("Disk registry does not have a cache")
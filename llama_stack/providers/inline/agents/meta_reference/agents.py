@@ -4,13 +4,18 @@
 # This source code is licensed under the terms described in the LICENSE file in
 # the root directory of this source tree.
 
-import json
+import asyncio
+import functools
 import logging
 import shutil
 import tempfile
 import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import AsyncGenerator, List, Optional, Union
 
+import orjson
+
 from llama_stack.apis.agents import (
     Agent,
     AgentConfig,
@@ -45,6 +50,24 @@ from .config import MetaReferenceAgentsImplConfig
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+AGENT_CACHE_SIZE = 512
+
+AGENT_INDEX_PREFIX = "agent_index:"
+
+
+@functools.cache
+def _bwrap_available() -> bool:
+    # walking $PATH costs dozens of stat calls and the answer never changes
+    # at runtime; test suites construct many provider instances
+    return shutil.which("bwrap") is not None
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso(s: str) -> datetime:
+    # created_at strings are immutable once written, so repeated list_agents
+    # calls over the same records hit the cache instead of re-parsing
+    return datetime.fromisoformat(s)
+
 
 class MetaReferenceAgentsImpl(Agents):
     def __init__(
@@ -65,12 +88,28 @@ class MetaReferenceAgentsImpl(Agents):
 
         self.in_memory_store = InmemoryKVStoreImpl()
         self.tempdir = tempfile.mkdtemp()
+        # Parsing and validating the stored config dominates per-call setup
+        # cost, so cache the validated AgentConfig; evicted LRU, dropped on
+        # delete. ChatAgent itself carries per-turn tool state and must be
+        # constructed fresh for every call.
+        self._agent_config_cache: OrderedDict[str, AgentConfig] = OrderedDict()
 
     async def initialize(self) -> None:
         self.persistence_store = await kvstore_impl(self.config.persistence_store)
 
+        # one-time migration from the old single-blob index; the presence keys
+        # avoid rewriting the whole list on every create/delete and stay
+        # consistent across processes sharing the store
+        agent_ids_json = await self.persistence_store.get("agent_ids")
+        if agent_ids_json:
+            agent_ids = orjson.loads(agent_ids_json)
+            await self.persistence_store.multi_set(
+                [(f"{AGENT_INDEX_PREFIX}{agent_id}", "1") for agent_id in agent_ids]
+            )
+            await self.persistence_store.delete("agent_ids")
+
         # check if "bwrap" is available
-        if not shutil.which("bwrap"):
+        if not _bwrap_available():
             logger.warning("Warning: `bwrap` is not available. Code interpreter tool will not work correctly.")
 
     async def create_agent(
@@ -78,32 +117,57 @@ class MetaReferenceAgentsImpl(Agents):
         agent_config: AgentConfig,
     ) -> AgentCreateResponse:
         agent_id = str(uuid.uuid4())
+        created_at = datetime.now(timezone.utc)
 
-        await self.persistence_store.set(
-            key=f"agent:{agent_id}",
-            value=agent_config.model_dump_json(),
+        agent_record = orjson.dumps(
+            {
+                "config": agent_config.model_dump(mode="json"),
+                "created_at": created_at.isoformat(),
+            }
+        ).decode()
+
+        # One transaction for the record and the index entry.
+        await self.persistence_store.multi_set(
+            [
+                (f"agent:{agent_id}", agent_record),
+                (f"{AGENT_INDEX_PREFIX}{agent_id}", "1"),
+            ]
         )
+
         return AgentCreateResponse(
             agent_id=agent_id,
         )
 
     async def _get_agent_impl(self, agent_id: str) -> ChatAgent:
-        agent_config = await self.persistence_store.get(
-            key=f"agent:{agent_id}",
-        )
-        if not agent_config:
-            raise ValueError(f"Could not find agent config for {agent_id}")
+        agent_config = self._agent_config_cache.get(agent_id)
+        if agent_config is not None:
+            self._agent_config_cache.move_to_end(agent_id)
+        else:
+            agent_record = await self.persistence_store.get(
+                key=f"agent:{agent_id}",
+            )
+            if not agent_record:
+                raise ValueError(f"Could not find agent config for {agent_id}")
 
-        try:
-            agent_config = json.loads(agent_config)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Could not JSON decode agent config for {agent_id}") from e
+            try:
+                agent_record = orjson.loads(agent_record)
+            except orjson.JSONDecodeError as e:
+                raise ValueError(f"Could not JSON decode agent config for {agent_id}") from e
 
-        try:
-            agent_config = AgentConfig(**agent_config)
-        except Exception as e:
-            raise ValueError(f"Could not validate(?) agent config for {agent_id}") from e
+            try:
+                # records written before created_at was folded in hold the bare config
+                agent_config = AgentConfig(**agent_record.get("config", agent_record))
+            except Exception as e:
+                raise ValueError(f"Could not validate(?) agent config for {agent_id}") from e
 
+            self._agent_config_cache[agent_id] = agent_config
+            if len(self._agent_config_cache) > AGENT_CACHE_SIZE:
+                self._agent_config_cache.popitem(last=False)
+
+        # turns mutate toolgroup args through the config (e.g. appending the
+        # session's vector_db_id), so hand each ChatAgent a deep copy to keep
+        # the cached entry pristine
+        agent_config = agent_config.model_copy(deep=True)
         return ChatAgent(
             agent_id=agent_id,
             agent_config=agent_config,
@@ -214,10 +278,13 @@ class MetaReferenceAgentsImpl(Agents):
         turn_ids: Optional[List[str]] = None,
     ) -> Session:
         agent = await self._get_agent_impl(agent_id)
-        session_info = await agent.storage.get_session_info(session_id)
+        # independent reads; overlap them instead of paying two serial round trips
+        session_info, turns = await asyncio.gather(
+            agent.storage.get_session_info(session_id),
+            agent.storage.get_session_turns(session_id),
+        )
         if session_info is None:
             raise ValueError(f"Session {session_id} not found")
-        turns = await agent.storage.get_session_turns(session_id)
         if turn_ids:
             turns = [turn for turn in turns if turn.turn_id in turn_ids]
         return Session(
@@ -228,22 +295,85 @@ class MetaReferenceAgentsImpl(Agents):
         )
 
     async def delete_agents_session(self, agent_id: str, session_id: str) -> None:
-        await self.persistence_store.delete(f"session:{agent_id}:{session_id}")
+        agent = await self._get_agent_impl(agent_id)
+        await agent.storage.delete_session(session_id)
 
     async def delete_agent(self, agent_id: str) -> None:
+        self._agent_config_cache.pop(agent_id, None)
+        await self.persistence_store.delete(f"{AGENT_INDEX_PREFIX}{agent_id}")
         await self.persistence_store.delete(f"agent:{agent_id}")
+        # records written before created_at was folded in kept it in a separate key
+        await self.persistence_store.delete(f"agent:{agent_id}:created_at")
+        # earlier revisions kept a per-agent session index blob
+        await self.persistence_store.delete(f"agent:{agent_id}:session_ids")
 
     async def shutdown(self) -> None:
-        pass
+        await self.persistence_store.shutdown()
+
+    async def _agent_from_record(self, agent_id: str, record_json: str) -> Agent:
+        record = orjson.loads(record_json)
+        # records written before created_at was folded in hold the bare config
+        agent_config = AgentConfig(**record.get("config", record))
+
+        created_at_json = record.get("created_at")
+        if created_at_json is None:
+            # ...and keep created_at under a separate key
+            created_at_json = await self.persistence_store.get(f"agent:{agent_id}:created_at")
+
+        if created_at_json:
+            try:
+                created_at = _parse_iso(created_at_json)
+            except ValueError as e:
+                created_at = datetime.now(timezone.utc)
+                logger.error(f"Error parsing created_at for {agent_id}: {e}")
+        else:
+            created_at = datetime.now(timezone.utc)
+
+        return Agent(
+            agent_id=agent_id,
+            agent_config=agent_config,
+            created_at=created_at,
+        )
+
+    async def _agent_from_record_or_none(self, agent_id: str, record_json: str) -> Optional[Agent]:
+        try:
+            return await self._agent_from_record(agent_id, record_json)
+        except Exception as e:
+            logger.error(f"Error parsing agent record for {agent_id}: {e}")
+            return None
 
     async def list_agents(self) -> ListAgentsResponse:
-        pass
+        # One range scan over the index, then every agent's record in one
+        # batched round trip instead of one get per agent.
+        index_items = await self.persistence_store.items_with_prefix(AGENT_INDEX_PREFIX)
+        agent_ids = [key[len(AGENT_INDEX_PREFIX) :] for key, _ in index_items]
+        values = await self.persistence_store.multi_get([f"agent:{agent_id}" for agent_id in agent_ids])
+
+        agents = await asyncio.gather(
+            *(
+                self._agent_from_record_or_none(agent_id, record_json)
+                for agent_id, record_json in zip(agent_ids, values, strict=True)
+                if record_json
+            )
+        )
+        return ListAgentsResponse(data=[agent for agent in agents if agent is not None])
 
     async def get_agent(self, agent_id: str) -> Agent:
-        pass
+        record_json = await self.persistence_store.get(f"agent:{agent_id}")
+        if not record_json:
+            raise ValueError(f"Could not find agent config for {agent_id}")
+
+        try:
+            return await self._agent_from_record(agent_id, record_json)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Could not validate agent config for {agent_id}") from e
 
     async def list_agent_sessions(
         self,
         agent_id: str,
     ) -> ListAgentSessionsResponse:
-        pass
+        agent = await self._get_agent_impl(agent_id)
+        sessions = await agent.storage.list_sessions()
+        return ListAgentSessionsResponse(data=sessions)
@@ -4,15 +4,16 @@
 # This source code is licensed under the terms described in the LICENSE file in
 # the root directory of this source tree.
 
-import json
+import asyncio
 import logging
 import uuid
 from datetime import datetime, timezone
 from typing import List, Optional
 
+import orjson
 from pydantic import BaseModel
 
-from llama_stack.apis.agents import ToolExecutionStep, Turn
+from llama_stack.apis.agents import Session, ToolExecutionStep, Turn
 from llama_stack.distribution.access_control import check_access
 from llama_stack.distribution.datatypes import AccessAttributes
 from llama_stack.distribution.request_headers import get_auth_attributes
@@ -20,6 +21,26 @@ from llama_stack.providers.utils.kvstore import KVStore
 
 log = logging.getLogger(__name__)
 
+# Above this many turns, decoding moves off the event loop so other requests
+# are not blocked; for small lists the thread handoff would cost more than it
+# saves.
+TURN_DECODE_THREAD_THRESHOLD = 16
+
+# Keys fetched per page while listing sessions; bounds the raw-value working
+# set regardless of how many sessions an agent has.
+SESSION_LIST_PAGE_SIZE = 100
+
+
+def _decode_turns(values: List[str]) -> List[Turn]:
+    turns = []
+    for value in values:
+        try:
+            turns.append(Turn(**orjson.loads(value)))
+        except Exception as e:
+            log.error(f"Error parsing turn: {e}")
+    turns.sort(key=lambda x: (x.completed_at or datetime.min.replace(tzinfo=timezone.utc)))
+    return turns
+
 
 class AgentSessionInfo(BaseModel):
     session_id: str
@@ -55,6 +76,9 @@ class AgentPersistence:
         )
         return session_id
 
+    async def delete_session(self, session_id: str) -> None:
+        await self.kvstore.delete(key=f"session:{self.agent_id}:{session_id}")
+
     async def get_session_info(self, session_id: str) -> Optional[AgentSessionInfo]:
         value = await self.kvstore.get(
             key=f"session:{self.agent_id}:{session_id}",
@@ -62,7 +86,7 @@ class AgentPersistence:
         if not value:
             return None
 
-        session_info = AgentSessionInfo(**json.loads(value))
+        session_info = AgentSessionInfo(**orjson.loads(value))
 
         # Check access to session
         if not self._check_session_access(session_info):
@@ -86,6 +110,80 @@ class AgentPersistence:
 
         return session_info
 
+    async def list_sessions(self) -> List[Session]:
+        """List every session of this agent that the current user can access.
+
+        A single prefix scan fetches session and turn records together; keys
+        are classified structurally (a session record has no ":" after the
+        prefix, a turn record does) so only the short suffix is scanned
+        instead of the whole key. Sessions the user is not allowed to see are
+        filtered out.
+        """
+        prefix = f"session:{self.agent_id}:"
+        prefix_len = len(prefix)
+
+        sessions: List[Session] = []
+        # a session's record sorts immediately before its turn keys, so the
+        # paged scan sees each session's rows contiguously; accumulate the
+        # current session and flush when the id changes
+        pending_id: Optional[str] = None
+        pending_record: Optional[str] = None
+        pending_turn_values: List[str] = []
+
+        async def _flush() -> None:
+            nonlocal pending_id, pending_record, pending_turn_values
+            if pending_id is not None:
+                session = await self._build_session(pending_id, pending_record, pending_turn_values)
+                if session is not None:
+                    sessions.append(session)
+            pending_id, pending_record, pending_turn_values = None, None, []
+
+        after_key = None
+        while True:
+            items = await self.kvstore.items_with_prefix(prefix, limit=SESSION_LIST_PAGE_SIZE, after_key=after_key)
+            for key, value in items:
+                suffix = key[prefix_len:]
+                colon = suffix.find(":")
+                session_id = suffix if colon < 0 else suffix[:colon]
+                if session_id != pending_id:
+                    await _flush()
+                    pending_id = session_id
+                if colon < 0:
+                    pending_record = value
+                else:
+                    pending_turn_values.append(value)
+            if len(items) < SESSION_LIST_PAGE_SIZE:
+                break
+            after_key = items[-1][0]
+        await _flush()
+        return sessions
+
+    async def _build_session(
+        self, session_id: str, record: Optional[str], turn_values: List[str]
+    ) -> Optional[Session]:
+        if record is None:
+            # turn keys can outlive their session record after a delete
+            return None
+        try:
+            session_info = AgentSessionInfo(**orjson.loads(record))
+        except Exception as e:
+            log.error(f"Error parsing session info for {session_id}: {e}")
+            return None
+        if not self._check_session_access(session_info):
+            return None
+
+        if len(turn_values) > TURN_DECODE_THREAD_THRESHOLD:
+            turns = await asyncio.to_thread(_decode_turns, turn_values)
+        else:
+            turns = _decode_turns(turn_values)
+
+        return Session(
+            session_id=session_info.session_id,
+            session_name=session_info.session_name,
+            turns=turns,
+            started_at=session_info.started_at,
+        )
+
     async def add_vector_db_to_session(self, session_id: str, vector_db_id: str):
         session_info = await self.get_session_if_accessible(session_id)
         if session_info is None:
@@ -117,12 +215,12 @@ class AgentPersistence:
         turns = []
         for value in values:
             try:
-                turn = Turn(**json.loads(value))
+                turn = Turn(**orjson.loads(value))
                 turns.append(turn)
             except Exception as e:
                 log.error(f"Error parsing turn: {e}")
                 continue
-        turns.sort(key=lambda x: (x.completed_at or datetime.min))
+        turns.sort(key=lambda x: (x.completed_at or datetime.min.replace(tzinfo=timezone.utc)))
         return turns
 
     async def get_session_turn(self, session_id: str, turn_id: str) -> Optional[Turn]:
@@ -134,7 +232,7 @@ class AgentPersistence:
         )
         if not value:
             return None
-        return Turn(**json.loads(value))
+        return Turn(**orjson.loads(value))
 
     async def set_in_progress_tool_call_step(self, session_id: str, turn_id: str, step: ToolExecutionStep):
         if not await self.get_session_if_accessible(session_id):
@@ -152,7 +250,7 @@ class AgentPersistence:
         value = await self.kvstore.get(
             key=f"in_progress_tool_call_step:{self.agent_id}:{session_id}:{turn_id}",
         )
-        return ToolExecutionStep(**json.loads(value)) if value else None
+        return ToolExecutionStep(**orjson.loads(value)) if value else None
 
     async def set_num_infer_iters_in_turn(self, session_id: str, turn_id: str, num_infer_iters: int):
         if not await self.get_session_if_accessible(session_id):
@@ -137,8 +137,7 @@ class FaissVectorIOAdapter(VectorIO, VectorDBsProtocolPrivate):
             self.cache[vector_db.identifier] = index
 
     async def shutdown(self) -> None:
-        # Cleanup if needed
-        pass
+        await self.kvstore.shutdown()
 
     async def register_vector_db(
         self,
@@ -21,6 +21,7 @@ def available_providers() -> List[ProviderSpec]:
             provider_type="inline::meta-reference",
             pip_packages=[
                 "matplotlib",
+                "orjson",
                 "pillow",
                 "pandas",
                 "scikit-learn",
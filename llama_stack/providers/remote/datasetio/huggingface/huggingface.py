@@ -46,7 +46,8 @@ class HuggingfaceDatasetIOImpl(DatasetIO, DatasetsProtocolPrivate):
             dataset = Dataset.model_validate_json(dataset)
             self.dataset_infos[dataset.identifier] = dataset
 
-    async def shutdown(self) -> None: ...
+    async def shutdown(self) -> None:
+        await self.kvstore.shutdown()
 
     async def register_dataset(
         self,
@@ -5,15 +5,34 @@
 # the root directory of this source tree.
 
 from datetime import datetime
-from typing import List, Optional, Protocol
+from typing import List, Optional, Protocol, Tuple
+
+
+def prefix_range_end(prefix: str) -> str:
+    """Smallest key strictly greater than every key starting with `prefix`.
+
+    Lets prefix scans use the half-open interval `key >= prefix AND key < end`,
+    which backends can serve directly from their primary-key index.
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
 
 
 class KVStore(Protocol):
+    async def shutdown(self) -> None: ...
+
     # TODO: make the value type bytes instead of str
     async def set(self, key: str, value: str, expiration: Optional[datetime] = None) -> None: ...
 
     async def get(self, key: str) -> Optional[str]: ...
 
+    async def multi_get(self, keys: List[str]) -> List[Optional[str]]: ...
+
+    async def multi_set(self, items: List[Tuple[str, str]]) -> None: ...
+
     async def delete(self, key: str) -> None: ...
 
     async def range(self, start_key: str, end_key: str) -> List[str]: ...
+
+    async def items_with_prefix(
+        self, prefix: str, limit: Optional[int] = None, after_key: Optional[str] = None
+    ) -> List[Tuple[str, str]]: ...
@@ -4,31 +4,59 @@
 # This source code is licensed under the terms described in the LICENSE file in
 # the root directory of this source tree.
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from .api import KVStore
+from sortedcontainers import SortedDict
+
+from .api import KVStore, prefix_range_end
 from .config import KVStoreConfig, KVStoreType
 
 
 def kvstore_dependencies():
-    return ["aiosqlite", "psycopg2-binary", "redis", "pymongo"]
+    return ["aiosqlite", "psycopg2-binary", "redis", "pymongo", "sortedcontainers"]
 
 
 class InmemoryKVStoreImpl(KVStore):
     def __init__(self):
-        self._store = {}
+        # keys stay sorted so range/prefix queries are O(log N + k) instead of
+        # a scan over the whole dict
+        self._store = SortedDict()
 
     async def initialize(self) -> None:
         pass
 
+    async def shutdown(self) -> None:
+        pass
+
     async def get(self, key: str) -> Optional[str]:
         return self._store.get(key)
 
+    async def multi_get(self, keys: List[str]) -> List[Optional[str]]:
+        return [self._store.get(key) for key in keys]
+
     async def set(self, key: str, value: str) -> None:
         self._store[key] = value
 
+    async def multi_set(self, items: List[Tuple[str, str]]) -> None:
+        self._store.update(items)
+
+    async def delete(self, key: str) -> None:
+        self._store.pop(key, None)
+
     async def range(self, start_key: str, end_key: str) -> List[str]:
-        return [self._store[key] for key in self._store.keys() if key >= start_key and key < end_key]
+        return [self._store[key] for key in self._store.irange(start_key, end_key, inclusive=(True, False))]
+
+    async def items_with_prefix(
+        self, prefix: str, limit: Optional[int] = None, after_key: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        start = after_key if after_key is not None else prefix
+        keys = self._store.irange(start, prefix_range_end(prefix), inclusive=(after_key is None, False))
+        items = []
+        for key in keys:
+            items.append((key, self._store[key]))
+            if limit is not None and len(items) >= limit:
+                break
+        return items
 
 
 async def kvstore_impl(config: KVStoreConfig) -> KVStore:
@@ -6,12 +6,13 @@
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from pymongo import AsyncMongoClient
+from pymongo import AsyncMongoClient, UpdateOne
 
 from llama_stack.providers.utils.kvstore import KVStore
 
+from ..api import prefix_range_end
 from ..config import MongoDBKVStoreConfig
 
 log = logging.getLogger(__name__)
@@ -38,6 +39,12 @@ class MongoDBKVStoreImpl(KVStore):
             log.exception("Could not connect to MongoDB database server")
             raise RuntimeError("Could not connect to MongoDB database server") from e
 
+    async def shutdown(self) -> None:
+        if self.conn is not None:
+            await self.conn.close()
+            self.conn = None
+            self.collection = None
+
     def _namespaced_key(self, key: str) -> str:
         if not self.config.namespace:
             return key
@@ -54,6 +61,29 @@ class MongoDBKVStoreImpl(KVStore):
         result = await self.collection.find_one(query, {"value": 1, "_id": 0})
         return result["value"] if result else None
 
+    async def multi_set(self, items: List[Tuple[str, str]]) -> None:
+        if not items:
+            return
+        operations = [
+            UpdateOne(
+                {"key": self._namespaced_key(key)},
+                {"$set": {"value": value, "expiration": None}},
+                upsert=True,
+            )
+            for key, value in items
+        ]
+        await self.collection.bulk_write(operations)
+
+    async def multi_get(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        namespaced_keys = [self._namespaced_key(key) for key in keys]
+        cursor = self.collection.find({"key": {"$in": namespaced_keys}}, {"key": 1, "value": 1, "_id": 0})
+        values_by_key = {}
+        async for doc in cursor:
+            values_by_key[doc["key"]] = doc["value"]
+        return [values_by_key.get(key) for key in namespaced_keys]
+
     async def delete(self, key: str) -> None:
         key = self._namespaced_key(key)
         await self.collection.delete_one({"key": key})
@@ -69,3 +99,20 @@ class MongoDBKVStoreImpl(KVStore):
         async for doc in cursor:
             result.append(doc["value"])
         return result
+
+    async def items_with_prefix(
+        self, prefix: str, limit: Optional[int] = None, after_key: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        namespace_len = len(self.config.namespace) + 1 if self.config.namespace else 0
+        start_op = "$gt" if after_key is not None else "$gte"
+        start = self._namespaced_key(after_key) if after_key is not None else self._namespaced_key(prefix)
+        query = {
+            "key": {start_op: start, "$lt": prefix_range_end(self._namespaced_key(prefix))},
+        }
+        cursor = self.collection.find(query, {"key": 1, "value": 1, "_id": 0}).sort("key", 1)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        result = []
+        async for doc in cursor:
+            result.append((doc["key"][namespace_len:], doc["value"]))
+        return result
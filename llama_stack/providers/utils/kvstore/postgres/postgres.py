@@ -6,12 +6,12 @@
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import psycopg2
 from psycopg2.extras import DictCursor
 
-from ..api import KVStore
+from ..api import KVStore, prefix_range_end
 from ..config import PostgresKVStoreConfig
 
 log = logging.getLogger(__name__)
@@ -49,6 +49,14 @@ class PostgresKVStoreImpl(KVStore):
             log.exception("Could not connect to PostgreSQL database server")
             raise RuntimeError("Could not connect to PostgreSQL database server") from e
 
+    async def shutdown(self) -> None:
+        if self.cursor:
+            self.cursor.close()
+            self.cursor = None
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
     def _namespaced_key(self, key: str) -> str:
         if not self.config.namespace:
             return key
@@ -79,6 +87,34 @@ class PostgresKVStoreImpl(KVStore):
         result = self.cursor.fetchone()
         return result[0] if result else None
 
+    async def multi_set(self, items: List[Tuple[str, str]]) -> None:
+        if not items:
+            return
+        self.cursor.executemany(
+            f"""
+            INSERT INTO {self.config.table_name} (key, value, expiration)
+            VALUES (%s, %s, NULL)
+            ON CONFLICT (key) DO UPDATE
+            SET value = EXCLUDED.value, expiration = EXCLUDED.expiration
+            """,
+            [(self._namespaced_key(key), value) for key, value in items],
+        )
+
+    async def multi_get(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        namespaced_keys = [self._namespaced_key(key) for key in keys]
+        self.cursor.execute(
+            f"""
+            SELECT key, value FROM {self.config.table_name}
+            WHERE key = ANY(%s)
+            AND (expiration IS NULL OR expiration > NOW())
+            """,
+            (namespaced_keys,),
+        )
+        values_by_key = {row[0]: row[1] for row in self.cursor.fetchall()}
+        return [values_by_key.get(key) for key in namespaced_keys]
+
     async def delete(self, key: str) -> None:
         key = self._namespaced_key(key)
         self.cursor.execute(
@@ -100,3 +136,22 @@ class PostgresKVStoreImpl(KVStore):
             (start_key, end_key),
         )
         return [row[0] for row in self.cursor.fetchall()]
+
+    async def items_with_prefix(
+        self, prefix: str, limit: Optional[int] = None, after_key: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        end_key = prefix_range_end(self._namespaced_key(prefix))
+        op = ">" if after_key is not None else ">="
+        start = self._namespaced_key(after_key) if after_key is not None else self._namespaced_key(prefix)
+        sql = f"""
+            SELECT key, value FROM {self.config.table_name}
+            WHERE key {op} %s AND key < %s
+            AND (expiration IS NULL OR expiration > NOW())
+            ORDER BY key
+            """
+        params: tuple = (start, end_key)
+        if limit is not None:
+            sql += " LIMIT %s"
+            params = params + (limit,)
+        self.cursor.execute(sql, params)
+        return [(row[0], row[1]) for row in self.cursor.fetchall()]
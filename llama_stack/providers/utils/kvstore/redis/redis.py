@@ -4,8 +4,9 @@
 # This source code is licensed under the terms described in the LICENSE file in
 # the root directory of this source tree.
 
+import bisect
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from redis.asyncio import Redis
 
@@ -20,6 +21,9 @@ class RedisKVStoreImpl(KVStore):
     async def initialize(self) -> None:
         self.redis = Redis.from_url(self.config.url)
 
+    async def shutdown(self) -> None:
+        await self.redis.aclose()
+
     def _namespaced_key(self, key: str) -> str:
         if not self.config.namespace:
             return key
@@ -39,6 +43,17 @@ class RedisKVStoreImpl(KVStore):
         await self.redis.ttl(key)
         return value
 
+    async def multi_get(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        values = await self.redis.mget([self._namespaced_key(key) for key in keys])
+        return [value.decode("utf-8") if isinstance(value, bytes) else value for value in values]
+
+    async def multi_set(self, items: List[Tuple[str, str]]) -> None:
+        if not items:
+            return
+        await self.redis.mset({self._namespaced_key(key): value for key, value in items})
+
     async def delete(self, key: str) -> None:
         key = self._namespaced_key(key)
         await self.redis.delete(key)
@@ -68,3 +83,33 @@ class RedisKVStoreImpl(KVStore):
             ]
 
         return []
+
+    async def items_with_prefix(
+        self, prefix: str, limit: Optional[int] = None, after_key: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        namespace_len = len(self.config.namespace) + 1 if self.config.namespace else 0
+        prefix = self._namespaced_key(prefix)
+        cursor = 0
+        matching_keys = []
+        while True:
+            cursor, keys = await self.redis.scan(cursor, match=prefix + "*", count=1000)
+            matching_keys.extend(key.decode("utf-8") if isinstance(key, bytes) else key for key in keys)
+            if cursor == 0:
+                break
+
+        matching_keys.sort()
+        # SCAN has to walk all matching keys regardless, but only the
+        # requested page pays for value fetches
+        if after_key is not None:
+            matching_keys = matching_keys[bisect.bisect_right(matching_keys, self._namespaced_key(after_key)) :]
+        if limit is not None:
+            matching_keys = matching_keys[:limit]
+        if not matching_keys:
+            return []
+
+        values = await self.redis.mget(matching_keys)
+        return [
+            (key[namespace_len:], value.decode("utf-8") if isinstance(value, bytes) else value)
+            for key, value in zip(matching_keys, values, strict=True)
+            if value is not None
+        ]
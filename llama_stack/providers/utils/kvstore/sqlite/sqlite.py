@@ -4,65 +4,225 @@
 # This source code is licensed under the terms described in the LICENSE file in
 # the root directory of this source tree.
 
+import asyncio
 import os
+import threading
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import aiosqlite
 
-from ..api import KVStore
+from ..api import KVStore, prefix_range_end
 from ..config import SqliteKVStoreConfig
 
+# Each committed transaction pays an fsync, which dominates write latency.
+# Coalescing concurrent writes into one transaction amortizes that cost.
+WRITE_BATCH_SIZE = 64
+WRITE_MAX_WAIT_MS = 5
+WRITE_QUEUE_SIZE = 1024
+
+# Bumped when the table layout changes; stored in PRAGMA user_version so
+# existing databases are migrated exactly once.
+SCHEMA_VERSION = 1
+
 
 class SqliteKVStoreImpl(KVStore):
     def __init__(self, config: SqliteKVStoreConfig):
         self.db_path = config.db_path
         self.table_name = "kvstore"
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._set_sql = f"INSERT OR REPLACE INTO {self.table_name} (key, value, expiration) VALUES (?, ?, ?)"
+        self._get_sql = f"SELECT value, expiration FROM {self.table_name} WHERE key = ?"
+        self._delete_sql = f"DELETE FROM {self.table_name} WHERE key = ?"
+        # half-open [start, end) to match the prefix semantics used elsewhere
+        self._range_sql = f"SELECT key, value, expiration FROM {self.table_name} WHERE key >= ? AND key < ?"
+        self._items_sql = f"SELECT key, value FROM {self.table_name} WHERE key >= ? AND key < ? ORDER BY key"
 
     async def initialize(self):
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                f"""
-                CREATE TABLE IF NOT EXISTS {self.table_name} (
-                    key TEXT PRIMARY KEY,
-                    value TEXT,
-                    expiration TIMESTAMP
-                )
-            """
+        # Opening a connection per operation spawns a worker thread and re-opens
+        # the database file every time; a single long-lived connection makes each
+        # operation a single statement round-trip. WAL mode lets readers proceed
+        # while a write is in flight.
+        self._db = await aiosqlite.connect(self.db_path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
+        await self._db.execute("PRAGMA temp_store=MEMORY")
+        await self._db.execute("PRAGMA cache_size=-20000")
+        await self._ensure_schema()
+
+        self._write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+        # The connection's worker thread is non-daemon and only exits on
+        # close(), so a store that is never shut down would block interpreter
+        # exit. threading._register_atexit runs before non-daemon threads are
+        # joined (regular atexit callbacks run after, too late to help); this
+        # is the same hook concurrent.futures uses to shut down its workers.
+        threading._register_atexit(self._close_at_exit)
+
+    async def _ensure_schema(self) -> None:
+        """Create the KV table, migrating legacy rowid databases in place.
+
+        The table is WITHOUT ROWID: a plain TEXT PRIMARY KEY gives SQLite a
+        rowid B-tree plus a separate PK index, so every lookup traverses two
+        trees. Storing rows inline in the PK B-tree halves the I/O for our
+        small key/value rows.
+        """
+        async with self._db.execute("PRAGMA user_version") as cursor:
+            (version,) = await cursor.fetchone()
+        if version >= SCHEMA_VERSION:
+            return
+
+        create_sql = f"""
+            CREATE TABLE IF NOT EXISTS {self.table_name} (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                expiration TIMESTAMP
+            ) WITHOUT ROWID
+        """
+        async with self._db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", (self.table_name,)
+        ) as cursor:
+            table_exists = await cursor.fetchone() is not None
+
+        if table_exists:
+            # version 0 tables were created without WITHOUT ROWID; copy the
+            # rows into a fresh table with the new layout
+            await self._db.execute(f"ALTER TABLE {self.table_name} RENAME TO {self.table_name}_old")
+            await self._db.execute(create_sql)
+            await self._db.execute(
+                f"INSERT INTO {self.table_name} SELECT key, value, expiration FROM {self.table_name}_old"
             )
-            await db.commit()
+            await self._db.execute(f"DROP TABLE {self.table_name}_old")
+        else:
+            await self._db.execute(create_sql)
+
+        await self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        await self._db.commit()
+
+    def _close_at_exit(self) -> None:
+        db, self._db = self._db, None
+        if db is not None:
+            asyncio.run(db.close())
+
+    async def shutdown(self) -> None:
+        if self._writer_task is not None:
+            await self._write_queue.put(None)
+            await self._writer_task
+            self._writer_task = None
+            self._write_queue = None
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
 
     async def set(self, key: str, value: str, expiration: Optional[datetime] = None) -> None:
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                f"INSERT OR REPLACE INTO {self.table_name} (key, value, expiration) VALUES (?, ?, ?)",
-                (key, value, expiration),
-            )
-            await db.commit()
+        await self._enqueue_write("set", (key, value, expiration))
+
+    async def multi_set(self, items: List[Tuple[str, str]]) -> None:
+        if not items:
+            return
+        await self._enqueue_write("multi_set", [(key, value, None) for key, value in items])
+
+    async def _enqueue_write(self, op: str, payload) -> None:
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((op, payload, future))
+        await future
+
+    async def _writer_loop(self) -> None:
+        """Drain queued mutations into batched transactions.
+
+        Waits for one pending mutation, then collects up to WRITE_BATCH_SIZE
+        entries (waiting at most WRITE_MAX_WAIT_MS for stragglers), applies
+        them in queue order inside a single transaction and resolves each
+        caller's future. Every mutation goes through the queue so that e.g. a
+        delete enqueued after a set of the same key cannot commit before it.
+        """
+        stop = False
+        while not stop:
+            item = await self._write_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = await asyncio.wait_for(self._write_queue.get(), timeout=WRITE_MAX_WAIT_MS / 1000)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                async with self._lock:
+                    for op, payload, _ in batch:
+                        if op == "set":
+                            await self._db.execute(self._set_sql, payload)
+                        elif op == "delete":
+                            await self._db.execute(self._delete_sql, payload)
+                        else:  # multi_set
+                            await self._db.executemany(self._set_sql, payload)
+                    await self._db.commit()
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
 
     async def get(self, key: str) -> Optional[str]:
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(f"SELECT value, expiration FROM {self.table_name} WHERE key = ?", (key,)) as cursor:
+        async with self._lock:
+            async with self._db.execute(self._get_sql, (key,)) as cursor:
                 row = await cursor.fetchone()
-                if row is None:
-                    return None
-                value, expiration = row
-                return value
+        if row is None:
+            return None
+        value, expiration = row
+        return value
+
+    async def multi_get(self, keys: List[str]) -> List[Optional[str]]:
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        sql = f"SELECT key, value FROM {self.table_name} WHERE key IN ({placeholders})"
+        async with self._lock:
+            async with self._db.execute(sql, keys) as cursor:
+                values_by_key = {key: value async for key, value in cursor}
+        return [values_by_key.get(key) for key in keys]
 
     async def delete(self, key: str) -> None:
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(f"DELETE FROM {self.table_name} WHERE key = ?", (key,))
-            await db.commit()
+        await self._enqueue_write("delete", (key,))
 
     async def range(self, start_key: str, end_key: str) -> List[str]:
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                f"SELECT key, value, expiration FROM {self.table_name} WHERE key >= ? AND key <= ?",
-                (start_key, end_key),
-            ) as cursor:
+        async with self._lock:
+            async with self._db.execute(self._range_sql, (start_key, end_key)) as cursor:
                 result = []
                 async for row in cursor:
                     _, value, _ = row
                     result.append(value)
                 return result
+
+    async def items_with_prefix(
+        self, prefix: str, limit: Optional[int] = None, after_key: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+        if limit is None and after_key is None:
+            sql = self._items_sql
+            params: Tuple = (prefix, prefix_range_end(prefix))
+        else:
+            # resume strictly after the cursor key; the PK index serves the
+            # ORDER BY + LIMIT without materializing the rest of the range
+            op = ">" if after_key is not None else ">="
+            start = after_key if after_key is not None else prefix
+            sql = f"SELECT key, value FROM {self.table_name} WHERE key {op} ? AND key < ? ORDER BY key"
+            params = (start, prefix_range_end(prefix))
+            if limit is not None:
+                sql += " LIMIT ?"
+                params = params + (limit,)
+        async with self._lock:
+            async with self._db.execute(sql, params) as cursor:
+                return [(key, value) async for key, value in cursor]
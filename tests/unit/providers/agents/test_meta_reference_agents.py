@@ -0,0 +1,139 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import orjson
+import pytest
+
+from llama_stack.apis.agents import AgentConfig
+from llama_stack.providers.inline.agents.meta_reference.agents import (
+    AGENT_INDEX_PREFIX,
+    MetaReferenceAgentsImpl,
+)
+from llama_stack.providers.inline.agents.meta_reference.config import MetaReferenceAgentsImplConfig
+from llama_stack.providers.utils.kvstore.config import SqliteKVStoreConfig
+
+
+def _make_impl(db_path: str) -> MetaReferenceAgentsImpl:
+    config = MetaReferenceAgentsImplConfig(persistence_store=SqliteKVStoreConfig(db_path=db_path))
+    return MetaReferenceAgentsImpl(
+        config=config,
+        inference_api=None,
+        vector_io_api=None,
+        safety_api=None,
+        tool_runtime_api=None,
+        tool_groups_api=None,
+    )
+
+
+def _agent_config(**overrides) -> AgentConfig:
+    params = dict(model="test-model", instructions="You are a helpful assistant")
+    params.update(overrides)
+    return AgentConfig(**params)
+
+
+@pytest.fixture
+async def agents_impl():
+    temp_dir = tempfile.mkdtemp()
+    impl = _make_impl(os.path.join(temp_dir, "agents.db"))
+    await impl.initialize()
+    yield impl
+    await impl.shutdown()
+    shutil.rmtree(temp_dir)
+
+
+@pytest.mark.asyncio
+async def test_create_list_get_delete_agents(agents_impl):
+    first = await agents_impl.create_agent(_agent_config())
+    second = await agents_impl.create_agent(_agent_config(instructions="You are terse"))
+
+    response = await agents_impl.list_agents()
+    agents_by_id = {agent.agent_id: agent for agent in response.data}
+    assert set(agents_by_id) == {first.agent_id, second.agent_id}
+    for agent in agents_by_id.values():
+        assert agent.created_at.tzinfo is not None
+
+    agent = await agents_impl.get_agent(second.agent_id)
+    assert agent.agent_config.instructions == "You are terse"
+
+    await agents_impl.delete_agent(first.agent_id)
+    response = await agents_impl.list_agents()
+    assert [agent.agent_id for agent in response.data] == [second.agent_id]
+    with pytest.raises(ValueError):
+        await agents_impl.get_agent(first.agent_id)
+
+
+@pytest.mark.asyncio
+async def test_legacy_agent_records(agents_impl):
+    # old-format rows: bare config at agent:{id}, created_at under its own key
+    agent_id = str(uuid.uuid4())
+    created_at = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    await agents_impl.persistence_store.multi_set(
+        [
+            (f"agent:{agent_id}", _agent_config().model_dump_json()),
+            (f"agent:{agent_id}:created_at", created_at.isoformat()),
+            (f"{AGENT_INDEX_PREFIX}{agent_id}", "1"),
+        ]
+    )
+
+    agent = await agents_impl.get_agent(agent_id)
+    assert agent.created_at == created_at
+    assert agent.agent_config.model == "test-model"
+
+    response = await agents_impl.list_agents()
+    assert [agent.agent_id for agent in response.data] == [agent_id]
+    assert response.data[0].created_at == created_at
+
+
+@pytest.mark.asyncio
+async def test_agent_ids_blob_migration():
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "agents.db")
+    try:
+        agent_id = str(uuid.uuid4())
+        impl = _make_impl(db_path)
+        await impl.initialize()
+        # simulate a store written before the presence-key index
+        await impl.persistence_store.set(f"agent:{agent_id}", _agent_config().model_dump_json())
+        await impl.persistence_store.set("agent_ids", orjson.dumps([agent_id]).decode())
+        await impl.shutdown()
+
+        impl = _make_impl(db_path)
+        await impl.initialize()
+        response = await impl.list_agents()
+        assert [agent.agent_id for agent in response.data] == [agent_id]
+        assert await impl.persistence_store.get("agent_ids") is None
+        await impl.shutdown()
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+@pytest.mark.asyncio
+@patch("llama_stack.providers.inline.agents.meta_reference.persistence.get_auth_attributes")
+async def test_list_agent_sessions_filters_inaccessible(mock_get_auth_attributes, agents_impl):
+    create_response = await agents_impl.create_agent(_agent_config(enable_session_persistence=True))
+    agent_id = create_response.agent_id
+
+    mock_get_auth_attributes.return_value = {"roles": ["admin"]}
+    admin_session = await agents_impl.create_agent_session(agent_id, "admin session")
+
+    mock_get_auth_attributes.return_value = {"roles": ["user"]}
+    user_session = await agents_impl.create_agent_session(agent_id, "user session")
+
+    # the admin sees both sessions, the user only their own
+    mock_get_auth_attributes.return_value = {"roles": ["admin", "user"]}
+    response = await agents_impl.list_agent_sessions(agent_id)
+    assert {s.session_id for s in response.data} == {admin_session.session_id, user_session.session_id}
+
+    mock_get_auth_attributes.return_value = {"roles": ["user"]}
+    response = await agents_impl.list_agent_sessions(agent_id)
+    assert [s.session_id for s in response.data] == [user_session.session_id]
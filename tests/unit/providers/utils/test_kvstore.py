@@ -0,0 +1,131 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the terms described in the LICENSE file in
+# the root directory of this source tree.
+
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+import pytest_asyncio
+
+from llama_stack.providers.utils.kvstore import InmemoryKVStoreImpl
+from llama_stack.providers.utils.kvstore.config import SqliteKVStoreConfig
+from llama_stack.providers.utils.kvstore.sqlite import SqliteKVStoreImpl
+
+
+@pytest_asyncio.fixture
+async def sqlite_kvstore():
+    temp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(temp_dir, "test_kvstore.db")
+    kvstore = SqliteKVStoreImpl(SqliteKVStoreConfig(db_path=db_path))
+    await kvstore.initialize()
+    yield kvstore
+    await kvstore.shutdown()
+    shutil.rmtree(temp_dir)
+
+
+@pytest_asyncio.fixture
+async def inmemory_kvstore():
+    kvstore = InmemoryKVStoreImpl()
+    await kvstore.initialize()
+    return kvstore
+
+
+@pytest.mark.asyncio
+async def test_sqlite_basic_ops(sqlite_kvstore):
+    await sqlite_kvstore.set("foo", "bar")
+    assert await sqlite_kvstore.get("foo") == "bar"
+
+    await sqlite_kvstore.set("foo", "baz")
+    assert await sqlite_kvstore.get("foo") == "baz"
+
+    await sqlite_kvstore.delete("foo")
+    assert await sqlite_kvstore.get("foo") is None
+
+
+async def _check_items_with_prefix(kvstore):
+    await kvstore.set("session:agent1:s1", "session-1")
+    await kvstore.set("session:agent1:s1:t1", "turn-1")
+    await kvstore.set("session:agent1:s2", "session-2")
+    await kvstore.set("session:agent2:s3", "other-agent")
+    # A key right past the prefix range must not be included.
+    await kvstore.set("session:agent1;", "out-of-range")
+
+    items = await kvstore.items_with_prefix("session:agent1:")
+    assert sorted(items) == [
+        ("session:agent1:s1", "session-1"),
+        ("session:agent1:s1:t1", "turn-1"),
+        ("session:agent1:s2", "session-2"),
+    ]
+
+    assert await kvstore.items_with_prefix("session:agent3:") == []
+
+
+@pytest.mark.asyncio
+async def test_sqlite_concurrent_writes_are_coalesced(sqlite_kvstore):
+    # Concurrent sets land in one (or few) batched transactions; every write
+    # must still be durable and readable afterwards.
+    await asyncio.gather(*(sqlite_kvstore.set(f"key-{i}", f"value-{i}") for i in range(100)))
+    values = await sqlite_kvstore.multi_get([f"key-{i}" for i in range(100)])
+    assert values == [f"value-{i}" for i in range(100)]
+
+
+@pytest.mark.asyncio
+async def test_sqlite_write_ordering(sqlite_kvstore):
+    # Mutations commit in queue order, so a delete enqueued after a set of the
+    # same key must win even when they end up in the same batch.
+    async def set_then_delete(i):
+        await sqlite_kvstore.set(f"ord-{i}", "value")
+        await sqlite_kvstore.delete(f"ord-{i}")
+
+    await asyncio.gather(*(set_then_delete(i) for i in range(50)))
+    assert await sqlite_kvstore.multi_get([f"ord-{i}" for i in range(50)]) == [None] * 50
+
+
+async def _check_multi_get(kvstore):
+    await kvstore.set("a", "1")
+    await kvstore.set("b", "2")
+    assert await kvstore.multi_get(["b", "missing", "a"]) == ["2", None, "1"]
+    assert await kvstore.multi_get([]) == []
+
+
+@pytest.mark.asyncio
+async def test_sqlite_multi_get(sqlite_kvstore):
+    await _check_multi_get(sqlite_kvstore)
+
+
+@pytest.mark.asyncio
+async def test_inmemory_multi_get(inmemory_kvstore):
+    await _check_multi_get(inmemory_kvstore)
+
+
+async def _check_multi_set(kvstore):
+    await kvstore.set("a", "old")
+    await kvstore.multi_set([("a", "1"), ("b", "2")])
+    assert await kvstore.get("a") == "1"
+    assert await kvstore.get("b") == "2"
+    await kvstore.multi_set([])
+
+
+@pytest.mark.asyncio
+async def test_sqlite_multi_set(sqlite_kvstore):
+    await _check_multi_set(sqlite_kvstore)
+
+
+@pytest.mark.asyncio
+async def test_inmemory_multi_set(inmemory_kvstore):
+    await _check_multi_set(inmemory_kvstore)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_items_with_prefix(sqlite_kvstore):
+    await _check_items_with_prefix(sqlite_kvstore)
+
+
+@pytest.mark.asyncio
+async def test_inmemory_items_with_prefix(inmemory_kvstore):
+    await _check_items_with_prefix(inmemory_kvstore)